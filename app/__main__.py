@@ -0,0 +1,39 @@
+# app/__main__.py: Server Launcher
+# to run the app with `python -m app`, using WEB_CONCURRENCY worker processes (default 1).
+# Each uvicorn worker is a separate process with its own event loop and embedding
+# and retrieval caches; the in-memory fallback store is also per worker, so only
+# run several workers against Qdrant.
+
+import sys
+
+import uvicorn
+
+from .config import (
+    HOST,
+    PORT,
+    WEB_CONCURRENCY,
+    KEEP_ALIVE_TIMEOUT,
+    LIMIT_CONCURRENCY,
+    BACKLOG,
+)
+
+
+def main() -> None:
+    uvicorn.run(
+        "app.main:app",
+        host=HOST,
+        port=PORT,
+        workers=WEB_CONCURRENCY,
+        # uvloop is not available on Windows; fall back to the stdlib loop there
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        # httptools serves pipelined HTTP/1.1 requests on a persistent connection
+        http="httptools",
+        # Hold idle connections long enough for bursty clients to reuse them
+        timeout_keep_alive=KEEP_ALIVE_TIMEOUT,
+        limit_concurrency=LIMIT_CONCURRENCY,
+        backlog=BACKLOG,
+    )
+
+
+if __name__ == "__main__":
+    main()
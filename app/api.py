@@ -3,52 +3,151 @@
 # The router is constructed with a RagService instance, so it is easy to test or replace.
 
 import time
+from typing import Any, Dict, Generic, Type, TypeVar
 
-from fastapi import APIRouter, HTTPException
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
 
-from .schemas import QuestionRequest, DocumentRequest
+from .schemas import (
+    QuestionRequest,
+    DocumentRequest,
+    BatchQuestionRequest,
+    BulkDocumentRequest,
+)
 from .services.rag import RagService
 
+S = TypeVar("S", bound=msgspec.Struct)
+
+_encoder = msgspec.json.Encoder()
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSON response serialized by msgspec's C encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return _encoder.encode(content)
+
+
+class JsonBody(Generic[S]):
+    """
+    FastAPI dependency that decodes the raw request body into a msgspec Struct.
+
+    This bypasses FastAPI's Pydantic body parsing. Since FastAPI cannot see
+    the body type, `openapi_extra` carries its schema for the /docs page.
+    """
+
+    def __init__(self, struct_type: Type[S]) -> None:
+        self._decoder = msgspec.json.Decoder(struct_type)
+        self.openapi_extra = _openapi_request_body(struct_type)
+
+    async def __call__(self, request: Request) -> S:
+        body = await request.body()
+        try:
+            return self._decoder.decode(body)
+        except msgspec.DecodeError as e:
+            # Let FastAPI's own handler build its usual 422 {"detail": [...]} body
+            raise RequestValidationError(
+                [{"type": "value_error", "loc": ("body",), "msg": str(e), "input": None}]
+            )
+
+
+def _openapi_request_body(struct_type: type) -> Dict[str, Any]:
+    """Build an OpenAPI requestBody entry from a struct's JSON schema."""
+    schema = msgspec.json.schema(struct_type)
+    definitions = schema.pop("$defs", {})
+
+    # Inline "#/$defs/..." references, which don't resolve inside an OpenAPI document
+    def inline(node: Any) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if ref is not None:
+                return inline(definitions[ref.rsplit("/", 1)[-1]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(value) for value in node]
+        return node
+
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": inline(schema)}},
+        }
+    }
+
 
 def create_router(rag_service: RagService) -> APIRouter:
     """
     Create an APIRouter wired to a specific RagService instance.
 
     This avoids global variables and keeps web concerns separate from
-    business logic.
+    business logic. Handlers return MsgspecJSONResponse directly, so results
+    are serialized by msgspec without a jsonable_encoder pass.
     """
     router = APIRouter()
 
-    @router.post("/ask")
-    def ask_question(req: QuestionRequest):
-        start = time.time()
+    question_body = JsonBody(QuestionRequest)
+    batch_body = JsonBody(BatchQuestionRequest)
+    document_body = JsonBody(DocumentRequest)
+    bulk_document_body = JsonBody(BulkDocumentRequest)
+
+    @router.post("/ask", openapi_extra=question_body.openapi_extra)
+    async def ask_question(req: QuestionRequest = Depends(question_body)):
+        start = time.perf_counter_ns()
         try:
-            result = rag_service.answer_question(req.question)
-            latency = round(time.time() - start, 3)
-            return {
+            result = await rag_service.answer_question(req.question)
+            latency = (time.perf_counter_ns() - start) / 1e9
+            return MsgspecJSONResponse({
                 "question": result["question"],
                 "answer": result["answer"],
                 "context_used": result["context_used"],
                 "latency_sec": latency,
-            }
+            })
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @router.post("/batch", openapi_extra=batch_body.openapi_extra)
+    async def ask_batch(req: BatchQuestionRequest = Depends(batch_body)):
+        start = time.perf_counter_ns()
+        try:
+            results = await rag_service.answer_questions(
+                [item.question for item in req.requests]
+            )
+            latency = (time.perf_counter_ns() - start) / 1e9
+            return MsgspecJSONResponse({
+                "results": results,
+                "latency_sec": latency,
+            })
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    @router.post("/add")
-    def add_document(req: DocumentRequest):
+    @router.post("/add", openapi_extra=document_body.openapi_extra)
+    async def add_document(req: DocumentRequest = Depends(document_body)):
         try:
-            doc_id = rag_service.add_document(req.text)
-            return {"id": doc_id, "status": "added"}
+            doc_id = await rag_service.add_document(req.text)
+            return MsgspecJSONResponse({"id": doc_id, "status": "added"})
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @router.post("/add_bulk", openapi_extra=bulk_document_body.openapi_extra)
+    async def add_documents(req: BulkDocumentRequest = Depends(bulk_document_body)):
+        try:
+            doc_ids = await rag_service.add_documents(req.texts)
+            return MsgspecJSONResponse({"ids": doc_ids, "status": "added"})
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
     @router.get("/status")
-    def status():
-        store = rag_service.document_store
-        return {
-            "qdrant_ready": store.uses_persistent_backend,
-            "in_memory_docs_count": store.in_memory_count,
-            "graph_ready": rag_service.is_ready,
-        }
+    async def status():
+        ready = rag_service.is_ready
+        store = rag_service.document_store if ready else None
+        return MsgspecJSONResponse({
+            "qdrant_ready": store.uses_persistent_backend if store else False,
+            "in_memory_docs_count": store.in_memory_count if store else 0,
+            "graph_ready": ready,
+            "embedding_cache_hits": rag_service.embedding_service.cache_hits,
+            "retrieval_cache_hits": store.cache_hits if store else 0,
+        })
 
-    return router
\ No newline at end of file
+    return router
@@ -10,4 +10,49 @@ QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
 QDRANT_COLLECTION_NAME = os.getenv("QDRANT_COLLECTION_NAME", "demo_collection")
 
 # Dimensionality of the embedding vectors.
-EMBEDDING_DIM = 128
\ No newline at end of file
+EMBEDDING_DIM = 128
+
+# Rank in-memory documents by embedding similarity instead of substring matching.
+IN_MEMORY_VECTOR_SEARCH = os.getenv("IN_MEMORY_VECTOR_SEARCH", "false").lower() in ("1", "true", "yes")
+
+# Maximum number of embeddings kept in the LRU cache (0 disables caching).
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+
+# Maximum number of retrieval results kept in the LRU cache (0 disables caching).
+RETRIEVAL_CACHE_SIZE = int(os.getenv("RETRIEVAL_CACHE_SIZE", "4096"))
+
+# Seconds a cached retrieval result stays valid (0 disables caching). Bounds how
+# stale results can get when other workers add documents to the same Qdrant collection.
+RETRIEVAL_CACHE_TTL = float(os.getenv("RETRIEVAL_CACHE_TTL", "5"))
+
+# Use the gRPC transport for Qdrant (faster than HTTP for upserts and queries).
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "true").lower() in ("1", "true", "yes")
+
+# Port of the Qdrant gRPC interface.
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+
+# Number of pooled connections to Qdrant. More in-flight RPCs hide per-call latency.
+QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", "100"))
+
+# Timeout (seconds) for Qdrant requests.
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "60"))
+
+# Keep int8 scalar-quantized vectors in RAM on the Qdrant side.
+QDRANT_SCALAR_QUANTIZATION = os.getenv("QDRANT_SCALAR_QUANTIZATION", "true").lower() in ("1", "true", "yes")
+
+# Address and port the server binds to when started with `python -m app`.
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+
+# Number of uvicorn worker processes (one GIL each). Defaults to a single worker:
+# the in-memory fallback store is per process, so only raise this when Qdrant is used.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Seconds an idle keep-alive connection is held open (uvicorn's default is 5).
+KEEP_ALIVE_TIMEOUT = int(os.getenv("KEEP_ALIVE_TIMEOUT", "75"))
+
+# Maximum concurrent connections/tasks per worker before new ones get HTTP 503.
+LIMIT_CONCURRENCY = int(os.getenv("LIMIT_CONCURRENCY", "1024"))
+
+# Maximum number of pending connections in the listen queue.
+BACKLOG = int(os.getenv("BACKLOG", "2048"))
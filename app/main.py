@@ -1,13 +1,32 @@
 # app/main.py: Application Entrypoint
 # to wire everything together and expose the FastAPI app object.
+# With Qdrant as the backend, the app can be scaled out across CPUs
+# (`uvicorn app.main:app --workers $(nproc)`): the collection is created only if
+# missing and point IDs are unique across workers. The in-memory fallback is per
+# worker, so run a single worker without Qdrant.
+
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from .config import QDRANT_URL, QDRANT_COLLECTION_NAME, EMBEDDING_DIM
+from .config import (
+    QDRANT_URL,
+    QDRANT_COLLECTION_NAME,
+    EMBEDDING_DIM,
+    EMBEDDING_CACHE_SIZE,
+    RETRIEVAL_CACHE_SIZE,
+    RETRIEVAL_CACHE_TTL,
+    IN_MEMORY_VECTOR_SEARCH,
+    QDRANT_PREFER_GRPC,
+    QDRANT_GRPC_PORT,
+    QDRANT_POOL_SIZE,
+    QDRANT_TIMEOUT,
+    QDRANT_SCALAR_QUANTIZATION,
+)
 from .services.embeddings import FakeEmbeddingService
-from .services.document_store import create_document_store
+from .services.document_store import CachingDocumentStore, create_document_store
 from .services.rag import RagService
-from .api import create_router
+from .api import MsgspecJSONResponse, create_router
 
 
 def create_app() -> FastAPI:
@@ -18,16 +37,48 @@ def create_app() -> FastAPI:
     - Instantiate infrastructure (embedding service, document store).
     - Instantiate RagService with explicit dependencies.
     - Create the FastAPI app and attach the router.
+
+    The document store talks to Qdrant through an async client, so it is
+    created inside the lifespan handler, on the event loop that serves requests,
+    and attached to the already-routed RagService.
     """
-    embedding_service = FakeEmbeddingService(dim=EMBEDDING_DIM)
-    document_store = create_document_store(
-        qdrant_url=QDRANT_URL,
-        collection_name=QDRANT_COLLECTION_NAME,
-        vector_size=EMBEDDING_DIM,
+    embedding_service = FakeEmbeddingService(
+        dim=EMBEDDING_DIM,
+        cache_size=EMBEDDING_CACHE_SIZE,
     )
-    rag_service = RagService(embedding_service, document_store)
+    rag_service = RagService(embedding_service)
 
-    app = FastAPI(title="Learning RAG Demo")
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        backend_store = await create_document_store(
+            qdrant_url=QDRANT_URL,
+            collection_name=QDRANT_COLLECTION_NAME,
+            vector_size=EMBEDDING_DIM,
+            prefer_grpc=QDRANT_PREFER_GRPC,
+            grpc_port=QDRANT_GRPC_PORT,
+            pool_size=QDRANT_POOL_SIZE,
+            timeout=QDRANT_TIMEOUT,
+            quantization=QDRANT_SCALAR_QUANTIZATION,
+            in_memory_vector_search=IN_MEMORY_VECTOR_SEARCH,
+        )
+        document_store = CachingDocumentStore(
+            backend_store,
+            maxsize=RETRIEVAL_CACHE_SIZE,
+            ttl=RETRIEVAL_CACHE_TTL,
+        )
+        await document_store.start()
+        rag_service.document_store = document_store
+        try:
+            yield
+        finally:
+            rag_service.document_store = None
+            await document_store.close()
+
+    app = FastAPI(
+        title="Learning RAG Demo",
+        lifespan=lifespan,
+        default_response_class=MsgspecJSONResponse,
+    )
     router = create_router(rag_service)
     app.include_router(router)
 
@@ -1,12 +1,24 @@
 # app/schemas.py: Request Models (Schemas)
-# to define the Pydantic models used in endpoint inputs and keep them separate from logic.
+# to define the msgspec structs used in endpoint inputs and keep them separate from logic.
+# msgspec decodes and validates a request body in a single C-level pass, without
+# building intermediate dicts or Pydantic models.
 
-from pydantic import BaseModel
+from typing import List
 
+import msgspec
 
-class QuestionRequest(BaseModel):
+
+class QuestionRequest(msgspec.Struct):
     question: str
 
 
-class DocumentRequest(BaseModel):
-    text: str
\ No newline at end of file
+class DocumentRequest(msgspec.Struct):
+    text: str
+
+
+class BulkDocumentRequest(msgspec.Struct):
+    texts: List[str]
+
+
+class BatchQuestionRequest(msgspec.Struct):
+    requests: List[QuestionRequest]
@@ -0,0 +1,132 @@
+# app/services/batching.py: Micro-Batching Helper
+# to coalesce concurrent calls into a single batched call (DataLoader-style).
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collects items submitted concurrently and hands them to `handler` in batches.
+
+    A single background worker drains the queue: it takes the first waiting
+    item, then keeps collecting until `max_batch` items are gathered or
+    `max_wait` seconds have passed, and calls `handler` once for the batch.
+    `handler` must return one result per item, in the same order.
+
+    If `weight` is given, `max_batch` caps the summed weight of a batch instead
+    of its item count (e.g. points per upsert when each item carries several).
+    An item that would push a batch over the cap opens the next batch; a single
+    item heavier than the cap is still dispatched, alone.
+
+    Only the worker calls `handler`, so batches never run concurrently.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[T]], Awaitable[List[R]]],
+        max_batch: int,
+        max_wait: float,
+        weight: Optional[Callable[[T], int]] = None,
+    ) -> None:
+        self._handler = handler
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._weight = weight
+        self._queue: Optional[asyncio.Queue[Tuple[T, asyncio.Future]]] = None
+        # Item taken off the queue that did not fit the previous batch
+        self._held: Optional[Tuple[T, asyncio.Future]] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the background worker on the running event loop."""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the worker and fail any items still waiting in the queue."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        pending = []
+        if self._held is not None:
+            pending.append(self._held)
+            self._held = None
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        _fail(pending, RuntimeError("MicroBatcher was stopped."))
+
+    async def submit(self, item: T) -> R:
+        """Queue an item and wait for its result."""
+        if self._worker is None:
+            raise RuntimeError("MicroBatcher has not been started.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[T, asyncio.Future]] = []
+            try:
+                if self._held is not None:
+                    entry, self._held = self._held, None
+                else:
+                    entry = await self._queue.get()
+                batch.append(entry)
+                size = self._size(entry)
+                deadline = loop.time() + self._max_wait
+
+                while size < self._max_batch:
+                    # Take whatever is already queued before waiting for more
+                    if not self._queue.empty():
+                        entry = self._queue.get_nowait()
+                    else:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            entry = await asyncio.wait_for(self._queue.get(), remaining)
+                        except asyncio.TimeoutError:
+                            break
+                    entry_size = self._size(entry)
+                    if size + entry_size > self._max_batch:
+                        self._held = entry
+                        break
+                    batch.append(entry)
+                    size += entry_size
+
+                results = await self._handler([item for item, _ in batch])
+            except Exception as exc:
+                _fail(batch, exc)
+                continue
+            except BaseException:
+                # Cancelled by stop() mid-batch: don't leave these callers waiting
+                _fail(batch, RuntimeError("MicroBatcher was stopped."))
+                raise
+
+            for (_, future), result in zip(batch, results):
+                # Skip callers that gave up (e.g. a cancelled request)
+                if not future.done():
+                    future.set_result(result)
+
+    def _size(self, entry: Tuple[T, asyncio.Future]) -> int:
+        return 1 if self._weight is None else self._weight(entry[0])
+
+
+def _fail(batch: List[Tuple[object, asyncio.Future]], exc: BaseException) -> None:
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(exc)
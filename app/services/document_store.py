@@ -3,37 +3,93 @@
 
 from __future__ import annotations
 
+import time
+import uuid
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Sequence
+from typing import List, Sequence, Tuple
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, VectorParams, Distance
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import (
+    PointStruct,
+    VectorParams,
+    Distance,
+    PayloadSelectorInclude,
+    QuantizationSearchParams,
+    QueryRequest,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+)
+
+from .batching import MicroBatcher
+
+# Upserts arriving within this window are coalesced into a single Qdrant call of at
+# most UPSERT_MAX_BATCH points; larger bulk adds are split into chunks of that size.
+UPSERT_MAX_BATCH = 512  # points
+UPSERT_MAX_WAIT = 0.005  # seconds
+
+# Concurrent queries arriving within this window share a single batched search call.
+QUERY_MAX_BATCH = 32
+QUERY_MAX_WAIT = 0.008  # seconds
+
+# Only the text is needed from each hit; skip other payload fields and vectors.
+_TEXT_ONLY = PayloadSelectorInclude(include=["text"])
+
+# Initial number of rows reserved in the in-memory embedding matrix.
+IN_MEMORY_INITIAL_CAPACITY = 1024
 
 
 @dataclass
 class Document:
-    """Simple in-memory representation of a stored document."""
+    """
+    Simple in-memory representation of a stored document.
+
+    The embedding is not kept here: InMemoryDocumentStore stores all embeddings
+    in one contiguous matrix, with row `id` belonging to this document.
+    """
     id: int
     text: str
-    embedding: List[float]
+    # Lowercased UTF-8 text, computed once at insertion for substring search
+    lower_bytes: bytes = b""
 
 
 class DocumentStore(ABC):
     """Abstract interface for storing and retrieving documents."""
 
     @abstractmethod
-    def add_document(self, text: str, embedding: List[float]) -> int:
+    async def add_document(self, text: str, embedding: Sequence[float]) -> int:
         """
         Store a document and its embedding.
         Returns an integer document ID.
         """
         raise NotImplementedError
 
+    async def add_documents(
+        self,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+    ) -> List[int]:
+        """
+        Store several documents and their embeddings.
+        Returns the document IDs in input order.
+
+        The default adds them one by one; backends override this to store
+        the whole batch in a single operation.
+        """
+        _check_batch(texts, embeddings)
+        return [
+            await self.add_document(text, embedding)
+            for text, embedding in zip(texts, embeddings)
+        ]
+
     @abstractmethod
-    def retrieve(
+    async def retrieve(
         self,
-        query_embedding: List[float],
+        query_embedding: Sequence[float],
         raw_query: str,
         limit: int = 2,
     ) -> List[str]:
@@ -45,6 +101,20 @@ class DocumentStore(ABC):
         """
         raise NotImplementedError
 
+    async def start(self) -> None:
+        """
+        Start background work (e.g. batching workers) on the running event loop.
+        No-op for stores that need none.
+        """
+        return None
+
+    async def close(self) -> None:
+        """
+        Release any resources held by the store (connections, background tasks).
+        No-op for stores that hold nothing external.
+        """
+        return None
+
     @property
     def in_memory_count(self) -> int:
         """
@@ -61,6 +131,45 @@ class DocumentStore(ABC):
         """
         return False
 
+    @property
+    def cache_hits(self) -> int:
+        """
+        Number of retrievals served from a cache (0 for uncached stores).
+        Used by the /status endpoint.
+        """
+        return 0
+
+
+def _check_batch(texts: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+    if len(texts) != len(embeddings):
+        raise ValueError(
+            f"Got {len(texts)} texts but {len(embeddings)} embeddings."
+        )
+
+
+def _normalize(vector: Sequence[float]) -> np.ndarray:
+    """Return `vector` as an L2-normalized float32 array (zero vectors stay zero)."""
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm > 0 else array
+
+
+def _quantize(vector: Sequence[float]) -> np.ndarray:
+    """L2-normalize `vector` and scale it to int8, so dot products rank by cosine."""
+    scaled = np.round(_normalize(vector) * 127)
+    return np.clip(scaled, -128, 127).astype(np.int8)
+
+
+def _new_point_id() -> int:
+    """
+    Random 53-bit point ID. Drawn from uuid4 (os.urandom), so independent
+    worker processes can't produce the same sequence, and small enough to
+    survive JSON clients that parse numbers as doubles (max safe integer 2**53 - 1).
+    The chance of any collision among n documents is about n**2 / 2**54,
+    i.e. roughly 1 in 18,000 for a million documents.
+    """
+    return uuid.uuid4().int >> 75
+
 
 class InMemoryDocumentStore(DocumentStore):
     """
@@ -68,30 +177,83 @@ class InMemoryDocumentStore(DocumentStore):
 
     Behaviour mirrors the original docs_memory implementation:
     - Substring-based retrieval with fallback to the first document.
+
+    With `use_vector_search`, retrieval instead ranks documents by cosine
+    similarity against the embedding matrix, like the Qdrant store. Embeddings
+    are stored int8-quantized, a quarter of the memory of float32.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, vector_size: int = 128, use_vector_search: bool = False) -> None:
         self._documents: List[Document] = []
+        self._use_vector_search = use_vector_search
+        # Struct-of-arrays layout: row i holds the int8-quantized embedding of
+        # self._documents[i]. Capacity doubles when full (amortized O(1) appends).
+        # Substring retrieval never reads embeddings, so no matrix is kept for it.
+        self._embeddings: np.ndarray | None = None
+        if use_vector_search:
+            self._embeddings = np.empty(
+                (IN_MEMORY_INITIAL_CAPACITY, vector_size),
+                dtype=np.int8,
+            )
+
+    async def add_document(self, text: str, embedding: Sequence[float]) -> int:
+        doc_ids = await self.add_documents([text], [embedding])
+        return doc_ids[0]
 
-    def add_document(self, text: str, embedding: List[float]) -> int:
+    async def add_documents(
+        self,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+    ) -> List[int]:
+        _check_batch(texts, embeddings)
         # Use index as ID (same pattern as original: len(docs_memory))
-        doc_id = len(self._documents)
-        doc = Document(id=doc_id, text=text, embedding=embedding)
-        self._documents.append(doc)
-        return doc_id
+        first_id = len(self._documents)
+        end = first_id + len(texts)
+
+        if self._embeddings is not None:
+            self._store_embeddings(first_id, embeddings)
+
+        for offset, text in enumerate(texts):
+            doc_id = first_id + offset
+            self._documents.append(
+                Document(
+                    id=doc_id,
+                    text=text,
+                    lower_bytes=text.lower().encode("utf-8"),
+                )
+            )
+
+        return list(range(first_id, end))
 
-    def retrieve(
+    def _store_embeddings(self, first_id: int, embeddings: Sequence[Sequence[float]]) -> None:
+        end = first_id + len(embeddings)
+        capacity = len(self._embeddings)
+        if end > capacity:
+            while capacity < end:
+                capacity *= 2
+            grown = np.empty((capacity, self._embeddings.shape[1]), dtype=np.int8)
+            grown[:first_id] = self._embeddings[:first_id]
+            self._embeddings = grown
+
+        for row, embedding in enumerate(embeddings, start=first_id):
+            self._embeddings[row] = _quantize(embedding)
+
+    async def retrieve(
         self,
-        query_embedding: List[float],
+        query_embedding: Sequence[float],
         raw_query: str,
         limit: int = 2,
     ) -> List[str]:
+        if self._use_vector_search:
+            return self._vector_search(query_embedding, limit)
+
         # Embedding is unused here; retrieval is purely substring-based.
+        # Documents are lowercased once at insertion, so each query only encodes itself.
         results: List[str] = []
-        query_lower = (raw_query or "").lower()
+        query_lower = (raw_query or "").lower().encode("utf-8")
 
         for doc in self._documents:
-            if query_lower in doc.text.lower():
+            if doc.lower_bytes.find(query_lower) != -1:
                 results.append(doc.text)
 
         # Fallback: if nothing matched but we have docs, return the first one
@@ -100,6 +262,23 @@ class InMemoryDocumentStore(DocumentStore):
 
         return results
 
+    def _vector_search(self, query_embedding: Sequence[float], limit: int) -> List[str]:
+        count = len(self._documents)
+        if count == 0 or limit <= 0:
+            return []
+
+        # Rows are normalized before quantization, so one matrix-vector product
+        # gives (scaled) cosine scores. int8 products sum exactly in float32 for
+        # any realistic dim, and float32 lets NumPy hand the product to BLAS.
+        query = _quantize(query_embedding).astype(np.float32)
+        scores = self._embeddings[:count].astype(np.float32) @ query
+        if limit < count:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(count)
+        top = top[np.argsort(-scores[top])]
+        return [self._documents[i].text for i in top]
+
     @property
     def in_memory_count(self) -> int:
         return len(self._documents)
@@ -109,50 +288,130 @@ class QdrantDocumentStore(DocumentStore):
     """
     Document store backed by a Qdrant collection.
 
-    On initialization, the collection is recreated, reproducing the original
-    semantics of recreating the collection on startup.
+    `initialize()` creates the collection only if it does not exist yet, so
+    restarts keep their data and several workers can start against the same
+    collection. Point IDs are random 53-bit integers, so workers writing to the
+    same collection cannot overwrite each other's documents. All network I/O goes
+    through the async client so concurrent requests overlap their round-trips.
+
+    Upserts and queries are micro-batched: concurrent `add_document` calls are
+    coalesced into one `upsert` RPC and concurrent `retrieve` calls into one
+    batched search RPC, by background workers started with `start()`.
     """
 
     def __init__(
         self,
-        client: QdrantClient,
+        client: AsyncQdrantClient,
         collection_name: str,
         vector_size: int,
+        quantization: bool = True,
     ) -> None:
         self._client = client
         self._collection_name = collection_name
         self._vector_size = vector_size
-        # Simple monotonically increasing ID generator
-        self._next_id = 0
+        # Whether the collection keeps int8 scalar-quantized copies of vectors in RAM
+        self._quantization = quantization
+        # Each queued item is one add call's (text, embedding) pairs
+        self._upsert_batcher: MicroBatcher[List[Tuple[str, Sequence[float]]], List[int]] = MicroBatcher(
+            self._upsert_batch,
+            max_batch=UPSERT_MAX_BATCH,
+            max_wait=UPSERT_MAX_WAIT,
+            weight=len,
+        )
+        self._query_batcher: MicroBatcher[Tuple[List[float], int], List[str]] = MicroBatcher(
+            self._query_batch,
+            max_batch=QUERY_MAX_BATCH,
+            max_wait=QUERY_MAX_WAIT,
+        )
 
-        self._ensure_collection()
+    async def initialize(self) -> None:
+        """Prepare the collection. Must be awaited before the store is used."""
+        await self._ensure_collection()
+
+    async def _ensure_collection(self) -> None:
+        if not await self._client.collection_exists(self._collection_name):
+            try:
+                await self._client.create_collection(
+                    collection_name=self._collection_name,
+                    vectors_config=VectorParams(
+                        size=self._vector_size,
+                        distance=Distance.COSINE,
+                    ),
+                    quantization_config=self._quantization_config(),
+                )
+            except Exception:
+                # Another worker may have created it between the check and the create
+                if not await self._client.collection_exists(self._collection_name):
+                    raise
+
+    def _search_params(self) -> SearchParams | None:
+        # Search the int8 copies, then rescore the top 2x candidates with the
+        # original vectors to keep recall
+        if not self._quantization:
+            return None
+        return SearchParams(
+            quantization=QuantizationSearchParams(rescore=True, oversampling=2.0),
+        )
 
-    def _ensure_collection(self) -> None:
-        self._client.recreate_collection(
-            collection_name=self._collection_name,
-            vectors_config=VectorParams(
-                size=self._vector_size,
-                distance=Distance.COSINE,
-            ),
+    def _quantization_config(self) -> ScalarQuantization | None:
+        if not self._quantization:
+            return None
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True),
         )
 
-    def add_document(self, text: str, embedding: List[float]) -> int:
-        doc_id = self._next_id
-        self._next_id += 1
+    async def start(self) -> None:
+        self._upsert_batcher.start()
+        self._query_batcher.start()
+
+    async def add_document(self, text: str, embedding: Sequence[float]) -> int:
+        doc_ids = await self._upsert_batcher.submit([(text, embedding)])
+        return doc_ids[0]
 
-        payload = {"text": text}
-        point = PointStruct(id=doc_id, vector=embedding, payload=payload)
+    async def add_documents(
+        self,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+    ) -> List[int]:
+        _check_batch(texts, embeddings)
+        if not texts:
+            return []
+        documents = list(zip(texts, embeddings))
+        # Each chunk fills a whole batch, so it is written by its own upsert. Chunks
+        # go out in order; if one fails, the earlier chunks stay stored.
+        doc_ids: List[int] = []
+        for start in range(0, len(documents), UPSERT_MAX_BATCH):
+            doc_ids.extend(
+                await self._upsert_batcher.submit(documents[start:start + UPSERT_MAX_BATCH])
+            )
+        return doc_ids
 
-        self._client.upsert(
+    async def _upsert_batch(
+        self,
+        items: List[List[Tuple[str, Sequence[float]]]],
+    ) -> List[List[int]]:
+        """Assign IDs to a batch of add calls and store all their documents with one upsert."""
+        ids_per_item: List[List[int]] = []
+        points: List[PointStruct] = []
+        for documents in items:
+            doc_ids: List[int] = []
+            for text, embedding in documents:
+                doc_id = _new_point_id()
+                payload = {"text": text}
+                points.append(PointStruct(id=doc_id, vector=list(embedding), payload=payload))
+                doc_ids.append(doc_id)
+            ids_per_item.append(doc_ids)
+
+        await self._client.upsert(
             collection_name=self._collection_name,
-            points=[point],
+            points=points,
         )
 
-        return doc_id
+        return ids_per_item
 
     # def retrieve(
     #     self,
-    #     query_embedding: List[float],
+    #     query_embedding: Sequence[float],
     #     raw_query: str,
     #     limit: int = 2,
     # ) -> List[str]:
@@ -207,61 +466,152 @@ class QdrantDocumentStore(DocumentStore):
     #             texts.append(str(payload["text"]))
     #     return texts
     
-    def retrieve(
+    async def retrieve(
         self,
-        query_embedding: List[float],
+        query_embedding: Sequence[float],
         raw_query: str,          # <--- add this parameter back
         limit: int = 2,
     ) -> List[str]:
         """
         Retrieve the top-k most similar documents given a query embedding.
 
-        Supports both:
-        - Newer Qdrant client: `query_points`
-        - Older Qdrant client: `search`
+        The query is queued and searched together with other concurrent
+        queries in a single batched call (see `_query_batch`).
 
         Note: raw_query is accepted for interface compatibility, but unused here.
         """
-        # Newer Qdrant (>= 1.10): unified query API
-        if hasattr(self._client, "query_points"):
-            response = self._client.query_points(
-                collection_name=self._collection_name,
-                query=list(query_embedding),   # dense vector
-                limit=limit,
-                with_payload=True,
-            )
-            hits = getattr(response, "points", [])
-        # Older Qdrant: still has `search`
-        elif hasattr(self._client, "search"):
-            hits = self._client.search(
-                collection_name=self._collection_name,
-                query_vector=list(query_embedding),
-                limit=limit,
-                with_payload=True,
-            )
-        else:
-            # Extremely unlikely, but explicit failure is better than a cryptic AttributeError
-            raise RuntimeError(
-                "QdrantClient has neither `query_points` nor `search`. "
-                "Please check the installed qdrant-client version."
-            )
+        return await self._query_batcher.submit((list(query_embedding), limit))
 
-        texts: List[str] = []
-        for hit in hits:
-            payload = getattr(hit, "payload", None)
-            if isinstance(payload, dict) and "text" in payload:
-                texts.append(str(payload["text"]))
-        return texts
+    async def _query_batch(self, items: List[Tuple[List[float], int]]) -> List[List[str]]:
+        """Run a batch of vector searches with one `query_batch_points` call."""
+        params = self._search_params()
+        responses = await self._client.query_batch_points(
+            collection_name=self._collection_name,
+            requests=[
+                QueryRequest(
+                    query=vector,
+                    limit=limit,
+                    params=params,
+                    with_payload=_TEXT_ONLY,
+                    with_vector=False,
+                )
+                for vector, limit in items
+            ],
+        )
+        hits_per_query = [getattr(response, "points", []) for response in responses]
+
+        results: List[List[str]] = []
+        for hits in hits_per_query:
+            texts: List[str] = []
+            for hit in hits:
+                payload = getattr(hit, "payload", None)
+                if isinstance(payload, dict) and "text" in payload:
+                    texts.append(str(payload["text"]))
+            results.append(texts)
+        return results
+
+    async def close(self) -> None:
+        await self._upsert_batcher.stop()
+        await self._query_batcher.stop()
+        await self._client.close()
 
     @property
     def uses_persistent_backend(self) -> bool:
         return True
 
 
-def create_document_store(
+class CachingDocumentStore(DocumentStore):
+    """
+    Wraps another store and keeps recent `retrieve` results in an LRU cache.
+
+    Results are keyed by (query_embedding, raw_query, limit). The cache is
+    cleared whenever documents are added through this wrapper, so a repeated
+    query never misses a document added by the same process. Entries also
+    expire after `ttl` seconds, which bounds how long a query can miss
+    documents added by other workers sharing a persistent backend.
+    """
+
+    def __init__(self, store: DocumentStore, maxsize: int = 4096, ttl: float = 5.0) -> None:
+        self._store = store
+        self._maxsize = maxsize
+        self._ttl = ttl
+        # key -> (expiry time on the monotonic clock, texts)
+        self._cache: OrderedDict[Tuple, Tuple[float, Tuple[str, ...]]] = OrderedDict()
+        self._hits = 0
+        # Bumped on every add so in-flight retrievals don't cache stale results
+        self._generation = 0
+
+    async def add_document(self, text: str, embedding: Sequence[float]) -> int:
+        doc_id = await self._store.add_document(text, embedding)
+        self._invalidate()
+        return doc_id
+
+    async def add_documents(
+        self,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+    ) -> List[int]:
+        doc_ids = await self._store.add_documents(texts, embeddings)
+        self._invalidate()
+        return doc_ids
+
+    def _invalidate(self) -> None:
+        self._generation += 1
+        self._cache.clear()
+
+    async def retrieve(
+        self,
+        query_embedding: Sequence[float],
+        raw_query: str,
+        limit: int = 2,
+    ) -> List[str]:
+        key = (tuple(query_embedding), raw_query, limit)
+        cached = self._cache.get(key)
+        if cached is not None:
+            expires_at, cached_texts = cached
+            if time.monotonic() < expires_at:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return list(cached_texts)
+            del self._cache[key]
+
+        generation = self._generation
+        texts = await self._store.retrieve(query_embedding, raw_query, limit)
+        if self._maxsize > 0 and self._ttl > 0 and generation == self._generation:
+            self._cache[key] = (time.monotonic() + self._ttl, tuple(texts))
+            if len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+        return texts
+
+    async def start(self) -> None:
+        await self._store.start()
+
+    async def close(self) -> None:
+        await self._store.close()
+
+    @property
+    def in_memory_count(self) -> int:
+        return self._store.in_memory_count
+
+    @property
+    def uses_persistent_backend(self) -> bool:
+        return self._store.uses_persistent_backend
+
+    @property
+    def cache_hits(self) -> int:
+        return self._hits
+
+
+async def create_document_store(
     qdrant_url: str,
     collection_name: str,
     vector_size: int,
+    prefer_grpc: bool = True,
+    grpc_port: int = 6334,
+    pool_size: int = 100,
+    timeout: int = 60,
+    quantization: bool = True,
+    in_memory_vector_search: bool = False,
 ) -> DocumentStore:
     """
     Try to create a Qdrant-backed store. If anything fails, fall back to in-memory.
@@ -269,15 +619,35 @@ def create_document_store(
     This preserves the original behaviour of:
     - "Trying Qdrant"
     - Printing a warning and falling back to a list if unavailable.
+
+    With `prefer_grpc`, upserts and queries go over the gRPC transport.
     """
+    client = None
     try:
-        client = QdrantClient(qdrant_url)
-        store: DocumentStore = QdrantDocumentStore(
+        client = AsyncQdrantClient(
+            url=qdrant_url,
+            prefer_grpc=prefer_grpc,
+            grpc_port=grpc_port,
+            pool_size=pool_size,
+            timeout=timeout,
+        )
+        store = QdrantDocumentStore(
             client=client,
             collection_name=collection_name,
             vector_size=vector_size,
+            quantization=quantization,
         )
+        await store.initialize()
         return store
     except Exception:
         print("Qdrant not available. Falling back to in-memory list.")
-        return InMemoryDocumentStore()
\ No newline at end of file
+        # Release the unused client's connections instead of leaving them to the GC
+        if client is not None:
+            try:
+                await client.close()
+            except Exception:
+                pass
+        return InMemoryDocumentStore(
+            vector_size=vector_size,
+            use_vector_search=in_memory_vector_search,
+        )
\ No newline at end of file
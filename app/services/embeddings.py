@@ -1,31 +1,61 @@
 # app/services/embeddings.py: Embedding Service
 # to encapsulate embedding generation behind a class so it is easy to swap or mock.
 
-from typing import List
-import random
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import xxhash
 
 
 class EmbeddingService:
     """Abstract interface for embedding text into vectors."""
 
-    def embed(self, text: str) -> List[float]:
+    def embed(self, text: str) -> Sequence[float]:
         raise NotImplementedError
-        
+
+    def embed_batch(self, texts: Sequence[str]) -> List[Sequence[float]]:
+        """Embed several texts; services with a batched model should override this."""
+        return [self.embed(text) for text in texts]
+
+    @property
+    def cache_hits(self) -> int:
+        """
+        Number of embeddings served from a cache (0 for uncached services).
+        Used by the /status endpoint.
+        """
+        return 0
+
 
 class FakeEmbeddingService(EmbeddingService):
     """
     Deterministic fake embedding service.
 
     This reproduces the behaviour of the original fake_embed function:
-    - The embedding is a list of `dim` random floats.
-    - A seed derived from the text ensures determinism across calls.
+    - The embedding is a sequence of `dim` random floats.
+    - A seed derived from the text ensures determinism across calls and processes.
+
+    The floats are drawn in one vectorized NumPy call rather than a Python loop,
+    and the most recent `cache_size` embeddings are kept in an LRU cache since
+    repeated questions are common. Embeddings are returned as tuples so cached
+    values cannot be mutated by callers.
     """
 
-    def __init__(self, dim: int = 128) -> None:
+    def __init__(self, dim: int = 128, cache_size: int = 4096) -> None:
         self._dim = dim
-
-    def embed(self, text: str) -> List[float]:
-        # Seed based on input so it's deterministic per text
-        seed = abs(hash(text)) % 10000
-        rng = random.Random(seed)
-        return [rng.random() for _ in range(self._dim)]
+        # Per-instance cache, so it does not keep the service alive or mix dims
+        self._embed_cached = lru_cache(maxsize=cache_size)(self._compute_embedding)
+
+    def embed(self, text: str) -> Tuple[float, ...]:
+        return self._embed_cached(text)
+
+    def _compute_embedding(self, text: str) -> Tuple[float, ...]:
+        # Seed based on input so it's deterministic per text. xxh3 is stable across
+        # processes (unlike the salted built-in hash) and uses the full 64 bits.
+        seed = xxhash.xxh3_64_intdigest(text.encode("utf-8"))
+        rng = np.random.Generator(np.random.PCG64(seed))
+        return tuple(rng.random(self._dim, dtype=np.float32).tolist())
+
+    @property
+    def cache_hits(self) -> int:
+        return self._embed_cached.cache_info().hits
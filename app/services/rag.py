@@ -1,73 +1,70 @@
 # app/services/rag.py: RAG Workflow Service
-# to encapsulate the RAG workflow (retrieval + answer) behind RagService, using LangGraph internally.
+# to encapsulate the RAG workflow (retrieval + answer) behind RagService.
 
-from typing import Any, Dict, List
-
-from langgraph.graph import StateGraph, END
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 from .embeddings import EmbeddingService
 from .document_store import DocumentStore
 
+# Bound format method of the answer template, looked up once at import time
+_ANSWER_FORMAT = "I found this: '{}...'".format
+# Number of characters of the top context document quoted in the answer
+_PREVIEW_CHARS = 100
+_NO_ANSWER = "Sorry, I don't know."
+# Number of documents retrieved as context for each question
+_CONTEXT_LIMIT = 2
+# Queue bound between the stages of answer_questions (retrievals in flight, give or take two)
+_PIPELINE_DEPTH = 32
+
+
+@dataclass(slots=True)
+class RagState:
+    """
+    Fixed-schema state of one question moving through the pipeline.
+
+    Slots avoid a per-instance __dict__, keeping per-request allocations small.
+    """
+    question: str
+    context: List[str] = field(default_factory=list)
+    answer: str = ""
+
+    def to_response(self) -> Dict[str, Any]:
+        return {
+            "question": self.question,
+            "answer": self.answer,
+            "context_used": self.context,
+        }
+
 
 class RagService:
     """
-    High-level RAG service built on LangGraph.
+    High-level RAG service.
 
     Responsibilities:
     - Orchestrate retrieval and answer steps.
-    - Hide LangGraph details from the API layer.
+    - Hide workflow details from the API layer.
     - Expose simple methods: answer_question, add_document.
+
+    The workflow is a linear retrieve -> answer pipeline, so it runs as plain
+    method calls; a graph framework would only add per-request scheduling and
+    state copies. Reintroduce one if the workflow gains real branching.
+
+    The document store may be attached after construction (see `create_app`,
+    which initializes it on application startup); until then the service is
+    not ready and its methods raise RuntimeError.
     """
 
     def __init__(
         self,
         embedding_service: EmbeddingService,
-        document_store: DocumentStore,
+        document_store: Optional[DocumentStore] = None,
     ) -> None:
         self._embedding_service = embedding_service
         self._document_store = document_store
-        self._chain = self._build_chain()
-
-    def _build_chain(self):
-        """
-        Build the LangGraph state graph.
 
-        State structure:
-        - Input: {"question": <str>}
-        - After retrieve: state["context"] = List[str]
-        - After answer:   state["answer"] = str
-        """
-        workflow = StateGraph(dict)
-
-        def retrieve_node(state: Dict[str, Any]) -> Dict[str, Any]:
-            question = state["question"]
-            query_embedding = self._embedding_service.embed(question)
-            context = self._document_store.retrieve(
-                query_embedding=query_embedding,
-                raw_query=question,
-                limit=2,
-            )
-            state["context"] = context
-            return state
-
-        def answer_node(state: Dict[str, Any]) -> Dict[str, Any]:
-            ctx: List[str] = state.get("context") or []
-            if ctx:
-                answer = f"I found this: '{ctx[0][:100]}...'"
-            else:
-                answer = "Sorry, I don't know."
-            state["answer"] = answer
-            return state
-
-        workflow.add_node("retrieve", retrieve_node)
-        workflow.add_node("answer", answer_node)
-        workflow.set_entry_point("retrieve")
-        workflow.add_edge("retrieve", "answer")
-        workflow.add_edge("answer", END)
-
-        return workflow.compile()
-
-    def answer_question(self, question: str) -> Dict[str, Any]:
+    async def answer_question(self, question: str) -> Dict[str, Any]:
         """
         Public method used by the API layer.
 
@@ -76,26 +73,109 @@ class RagService:
         - "answer"
         - "context_used"
         """
-        state: Dict[str, Any] = {"question": question}
-        result_state = self._chain.invoke(state)
-        return {
-            "question": question,
-            "answer": result_state["answer"],
-            "context_used": result_state.get("context", []),
-        }
+        state = RagState(question=question)
+        query_embedding = self._embedding_service.embed(state.question)
+        state.context = await self.document_store.retrieve(
+            query_embedding=query_embedding,
+            raw_query=state.question,
+            limit=_CONTEXT_LIMIT,
+        )
+        self._answer(state)
+        return state.to_response()
+
+    async def answer_questions(self, questions: List[str]) -> List[Dict[str, Any]]:
+        """
+        Answer several questions as a two-stage pipeline.
 
-    def add_document(self, text: str) -> int:
+        Stage A embeds each question and starts its retrieval; stage B awaits
+        the retrievals in order and formats the answers, so formatting one
+        answer overlaps with the retrievals of the following questions. A
+        queue bounded at _PIPELINE_DEPTH caps the retrievals in flight at
+        _PIPELINE_DEPTH + 2 (the queued ones, the one stage A is waiting to
+        enqueue, and the one stage B is awaiting); the document store
+        coalesces them into batched searches.
+
+        Returns one answer_question-style dict per question, in input order.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_PIPELINE_DEPTH)
+        responses: List[Dict[str, Any]] = []
+        # Every retrieval started, so none outlive this call if a stage fails
+        retrievals: List[asyncio.Future] = []
+
+        async def produce() -> None:
+            for question in questions:
+                state = RagState(question=question)
+                query_embedding = self._embedding_service.embed(question)
+                retrieval = asyncio.ensure_future(
+                    self.document_store.retrieve(
+                        query_embedding=query_embedding,
+                        raw_query=question,
+                        limit=_CONTEXT_LIMIT,
+                    )
+                )
+                retrievals.append(retrieval)
+                await queue.put((state, retrieval))
+
+        async def consume() -> None:
+            for _ in questions:
+                state, retrieval = await queue.get()
+                state.context = await retrieval
+                self._answer(state)
+                responses.append(state.to_response())
+
+        producer = asyncio.create_task(produce())
+        consumer = asyncio.create_task(consume())
+        try:
+            await asyncio.gather(producer, consumer)
+        finally:
+            # On failure, stop both stages and cancel retrievals nobody will await
+            producer.cancel()
+            consumer.cancel()
+            for retrieval in retrievals:
+                retrieval.cancel()
+
+        return responses
+
+    @staticmethod
+    def _answer(state: RagState) -> None:
+        """Fill in the answer from the retrieved context."""
+        if state.context:
+            top = state.context[0]
+            state.answer = _ANSWER_FORMAT(top[:_PREVIEW_CHARS] if len(top) > _PREVIEW_CHARS else top)
+        else:
+            state.answer = _NO_ANSWER
+
+    async def add_document(self, text: str) -> int:
         """
         Add a document via the embedding + storage pipeline.
         """
         embedding = self._embedding_service.embed(text)
-        doc_id = self._document_store.add_document(text, embedding)
+        doc_id = await self.document_store.add_document(text, embedding)
         return doc_id
 
+    async def add_documents(self, texts: List[str]) -> List[int]:
+        """
+        Add several documents at once; the store persists them in one operation.
+        """
+        embeddings = self._embedding_service.embed_batch(texts)
+        doc_ids = await self.document_store.add_documents(texts, embeddings)
+        return doc_ids
+
     @property
     def document_store(self) -> DocumentStore:
+        if self._document_store is None:
+            raise RuntimeError("Document store is not initialized.")
         return self._document_store
 
+    @document_store.setter
+    def document_store(self, document_store: Optional[DocumentStore]) -> None:
+        self._document_store = document_store
+
+    @property
+    def embedding_service(self) -> EmbeddingService:
+        return self._embedding_service
+
     @property
     def is_ready(self) -> bool:
-        return self._chain is not None
\ No newline at end of file
+        # Reported as the /status "graph_ready" field: ready once the store is attached
+        return self._document_store is not None
@@ -0,0 +1,116 @@
+# tests/test_batching.py: MicroBatcher Tests
+# to check batching, weight caps, timeout flushes, error fan-out and shutdown of the micro-batcher.
+
+import asyncio
+
+import pytest
+
+from app.services.batching import MicroBatcher
+
+
+def test_concurrent_submits_are_batched():
+    batch_sizes = []
+
+    async def handler(items):
+        batch_sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(handler, max_batch=4, max_wait=0.05)
+        batcher.start()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        await batcher.stop()
+        return results
+
+    assert asyncio.run(scenario()) == [i * 2 for i in range(10)]
+    assert batch_sizes == [4, 4, 2]
+
+
+def test_partial_batch_is_flushed_after_max_wait():
+    async def handler(items):
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(handler, max_batch=64, max_wait=0.01)
+        batcher.start()
+        # Far fewer items than max_batch: must still resolve once max_wait passes
+        result = await asyncio.wait_for(batcher.submit("only"), timeout=1.0)
+        await batcher.stop()
+        return result
+
+    assert asyncio.run(scenario()) == "only"
+
+
+def test_handler_error_fails_every_caller_in_the_batch():
+    async def handler(items):
+        raise ValueError("boom")
+
+    async def scenario():
+        batcher = MicroBatcher(handler, max_batch=8, max_wait=0.01)
+        batcher.start()
+        results = await asyncio.gather(
+            *(batcher.submit(i) for i in range(3)),
+            return_exceptions=True,
+        )
+        # The worker survives a failed batch
+        batcher_alive = not batcher._worker.done()
+        await batcher.stop()
+        return results, batcher_alive
+
+    results, batcher_alive = asyncio.run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert batcher_alive
+
+
+def test_stop_fails_in_flight_and_queued_items():
+    async def scenario():
+        started = asyncio.Event()
+
+        async def handler(items):
+            started.set()
+            await asyncio.sleep(10)
+            return items
+
+        batcher = MicroBatcher(handler, max_batch=1, max_wait=0.0)
+        batcher.start()
+        in_flight = asyncio.create_task(batcher.submit("in-flight"))
+        await started.wait()
+        queued = asyncio.create_task(batcher.submit("queued"))
+        await asyncio.sleep(0)
+
+        await batcher.stop()
+        return await asyncio.wait_for(
+            asyncio.gather(in_flight, queued, return_exceptions=True),
+            timeout=1.0,
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_submit_requires_start():
+    async def handler(items):
+        return items
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(MicroBatcher(handler, max_batch=1, max_wait=0.0).submit(1))
+
+
+def test_weight_caps_the_summed_size_of_a_batch():
+    batch_sizes = []
+
+    async def handler(items):
+        batch_sizes.append(sum(len(item) for item in items))
+        return [len(item) for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(handler, max_batch=5, max_wait=0.05, weight=len)
+        batcher.start()
+        # An item heavier than the cap is still dispatched, on its own
+        items = ["aaa", "aa", "aaa", "aaaaaaa", "a"]
+        results = await asyncio.gather(*(batcher.submit(item) for item in items))
+        await batcher.stop()
+        return results
+
+    assert asyncio.run(scenario()) == [3, 2, 3, 7, 1]
+    assert batch_sizes == [5, 3, 7, 1]
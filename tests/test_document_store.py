@@ -0,0 +1,231 @@
+# tests/test_document_store.py: Document Store Tests
+# to check the retrieval cache, in-memory vector search and upsert batching of the Qdrant store.
+
+import asyncio
+
+from app.services.document_store import (
+    IN_MEMORY_INITIAL_CAPACITY,
+    UPSERT_MAX_BATCH,
+    CachingDocumentStore,
+    DocumentStore,
+    InMemoryDocumentStore,
+    QdrantDocumentStore,
+)
+
+
+class _CountingStore(DocumentStore):
+    """Answers every query with the documents added so far and counts the calls."""
+
+    def __init__(self) -> None:
+        self.texts = []
+        self.retrieve_calls = 0
+        # When set, retrieve() waits for it before answering
+        self.gate = None
+
+    async def add_document(self, text, embedding):
+        self.texts.append(text)
+        return len(self.texts) - 1
+
+    async def retrieve(self, query_embedding, raw_query, limit=2):
+        self.retrieve_calls += 1
+        texts = list(self.texts)
+        if self.gate is not None:
+            await self.gate.wait()
+        return texts[:limit]
+
+
+def test_cache_serves_repeated_queries():
+    backend = _CountingStore()
+    store = CachingDocumentStore(backend)
+
+    async def scenario():
+        await store.add_document("doc", [1.0])
+        first = await store.retrieve([1.0], "q")
+        second = await store.retrieve([1.0], "q")
+        # A different limit is a different key
+        await store.retrieve([1.0], "q", limit=1)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == second == ["doc"]
+    assert backend.retrieve_calls == 2
+    assert store.cache_hits == 1
+
+
+def test_adding_documents_invalidates_the_cache():
+    backend = _CountingStore()
+    store = CachingDocumentStore(backend)
+
+    async def scenario():
+        await store.add_document("first", [1.0])
+        before = await store.retrieve([1.0], "q")
+        await store.add_documents(["second"], [[1.0]])
+        after = await store.retrieve([1.0], "q")
+        return before, after
+
+    before, after = asyncio.run(scenario())
+    assert before == ["first"]
+    assert after == ["first", "second"]
+    assert backend.retrieve_calls == 2
+
+
+def test_in_flight_retrieval_does_not_cache_across_an_add():
+    backend = _CountingStore()
+    store = CachingDocumentStore(backend)
+
+    async def scenario():
+        await store.add_document("first", [1.0])
+        backend.gate = asyncio.Event()
+        # Started before the add, so its result may be stale once it returns
+        in_flight = asyncio.create_task(store.retrieve([1.0], "q"))
+        await asyncio.sleep(0)
+        await store.add_document("second", [1.0])
+        backend.gate.set()
+        stale = await in_flight
+        fresh = await store.retrieve([1.0], "q")
+        return stale, fresh
+
+    stale, fresh = asyncio.run(scenario())
+    assert stale == ["first"]
+    assert fresh == ["first", "second"]
+    assert backend.retrieve_calls == 2
+
+
+def test_cached_results_expire_after_ttl():
+    backend = _CountingStore()
+    store = CachingDocumentStore(backend, ttl=0.01)
+
+    async def scenario():
+        await store.add_document("doc", [1.0])
+        await store.retrieve([1.0], "q")
+        await asyncio.sleep(0.05)
+        await store.retrieve([1.0], "q")
+
+    asyncio.run(scenario())
+    assert backend.retrieve_calls == 2
+    assert store.cache_hits == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    backend = _CountingStore()
+    store = CachingDocumentStore(backend, maxsize=2)
+
+    async def scenario():
+        await store.add_document("doc", [1.0])
+        await store.retrieve([1.0], "a")
+        await store.retrieve([1.0], "b")
+        await store.retrieve([1.0], "a")  # hit: "b" is now least recently used
+        await store.retrieve([1.0], "c")  # evicts "b"
+        await store.retrieve([1.0], "a")  # hit
+        await store.retrieve([1.0], "b")  # miss
+
+    asyncio.run(scenario())
+    assert store.cache_hits == 2
+    assert backend.retrieve_calls == 4
+
+
+def test_cache_is_disabled_by_zero_maxsize_or_ttl():
+    async def scenario(store):
+        await store.add_document("doc", [1.0])
+        await store.retrieve([1.0], "q")
+        await store.retrieve([1.0], "q")
+        return store.cache_hits
+
+    for options in ({"maxsize": 0}, {"ttl": 0}):
+        backend = _CountingStore()
+        assert asyncio.run(scenario(CachingDocumentStore(backend, **options))) == 0
+        assert backend.retrieve_calls == 2
+
+
+def test_vector_search_ranks_by_cosine_similarity():
+    store = InMemoryDocumentStore(vector_size=2, use_vector_search=True)
+
+    async def scenario():
+        await store.add_documents(
+            ["east", "north-east", "north"],
+            [[1.0, 0.0], [1.0, 1.0], [0.0, 1.0]],
+        )
+        top = await store.retrieve([1.0, 0.2], "", limit=2)
+        # A limit at or above the document count returns everything, still ranked
+        everything = await store.retrieve([0.0, 1.0], "", limit=10)
+        return top, everything
+
+    top, everything = asyncio.run(scenario())
+    assert top == ["east", "north-east"]
+    assert everything == ["north", "north-east", "east"]
+
+
+def test_vector_search_survives_embedding_matrix_growth():
+    store = InMemoryDocumentStore(vector_size=2, use_vector_search=True)
+    count = IN_MEMORY_INITIAL_CAPACITY + 1
+    texts = ["east"] + ["north-east"] * (count - 2) + ["north"]
+    embeddings = [[1.0, 0.0]] + [[1.0, 1.0]] * (count - 2) + [[0.0, 1.0]]
+
+    async def scenario():
+        # Added one at a time so the matrix grows mid-way
+        for text, embedding in zip(texts, embeddings):
+            await store.add_document(text, embedding)
+        first_row = await store.retrieve([1.0, 0.0], "", limit=1)
+        last_row = await store.retrieve([0.0, 1.0], "", limit=1)
+        return first_row, last_row
+
+    first_row, last_row = asyncio.run(scenario())
+    assert store.in_memory_count == count
+    assert first_row == ["east"]
+    assert last_row == ["north"]
+
+
+class _StubQdrantClient:
+    """Records upserted point batches; fails any upsert containing a "bad" document."""
+
+    def __init__(self) -> None:
+        self.upserts = []
+
+    async def upsert(self, collection_name, points):
+        if any(point.payload["text"] == "bad" for point in points):
+            raise ConnectionError("upsert failed")
+        self.upserts.append([point.payload["text"] for point in points])
+
+    async def close(self) -> None:
+        pass
+
+
+def test_failed_bulk_chunk_does_not_fail_other_adds():
+    client = _StubQdrantClient()
+    # Two full chunks; the second one fails
+    texts = ["doc"] * UPSERT_MAX_BATCH + ["bad"] + ["doc"] * (UPSERT_MAX_BATCH - 1)
+
+    async def scenario():
+        store = QdrantDocumentStore(client, collection_name="test", vector_size=2)
+        await store.start()
+        results = await asyncio.gather(
+            store.add_documents(texts, [[1.0, 0.0]] * len(texts)),
+            store.add_document("single", [0.0, 1.0]),
+            return_exceptions=True,
+        )
+        await store.close()
+        return results
+
+    bulk_result, single_result = asyncio.run(scenario())
+    assert isinstance(bulk_result, ConnectionError)
+    # The concurrent single add is never in the failed chunk's upsert
+    assert isinstance(single_result, int)
+    assert ["single"] in client.upserts
+    assert all(len(batch) <= UPSERT_MAX_BATCH for batch in client.upserts)
+
+
+def test_bulk_add_is_split_into_upsert_sized_chunks():
+    client = _StubQdrantClient()
+    texts = [f"doc {i}" for i in range(UPSERT_MAX_BATCH * 2 + 1)]
+
+    async def scenario():
+        store = QdrantDocumentStore(client, collection_name="test", vector_size=2)
+        await store.start()
+        doc_ids = await store.add_documents(texts, [[1.0, 0.0]] * len(texts))
+        await store.close()
+        return doc_ids
+
+    doc_ids = asyncio.run(scenario())
+    assert len(set(doc_ids)) == len(texts)
+    assert [len(batch) for batch in client.upserts] == [UPSERT_MAX_BATCH, UPSERT_MAX_BATCH, 1]
+    assert [text for batch in client.upserts for text in batch] == texts